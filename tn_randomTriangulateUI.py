@@ -1,7 +1,8 @@
 # Maya Python UI: Random Triangulate (lock axes selectable + boundary lock)
 import maya.cmds as cmds
-import random
-import re
+import maya.api.OpenMaya as om2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 WIN_NAME = "mokaRandomTriangulateUI"
 
@@ -32,59 +33,74 @@ def _get_mesh_transforms_from_selection():
 
     return out
 
+def _mesh_dag_path(obj):
+    """Transform -> MDagPath of its (non-intermediate) mesh shape."""
+    shapes = cmds.listRelatives(obj, shapes=True, fullPath=True, type="mesh") or []
+    shapes = [sh for sh in shapes if not cmds.getAttr(sh + ".intermediateObject")]
+    sel = om2.MSelectionList()
+    sel.add(shapes[0])
+    return sel.getDagPath(0)
+
 def _boundary_vertex_indices(obj):
     """Boundary edges (connected to exactly 1 face) -> collect their vertex indices."""
     boundary_verts = set()
-    edge_count = cmds.polyEvaluate(obj, edge=True) or 0
 
-    for e in range(edge_count):
-        edge = f"{obj}.e[{e}]"
-        info = cmds.polyInfo(edge, edgeToFace=True)
-        if not info:
-            continue
+    it_edge = om2.MItMeshEdge(_mesh_dag_path(obj))
+    while not it_edge.isDone():
+        if it_edge.onBoundary():
+            boundary_verts.add(it_edge.vertexId(0))
+            boundary_verts.add(it_edge.vertexId(1))
+        it_edge.next()
 
-        line = info[0].strip()
-        if ":" not in line:
-            continue
-
-        right = line.split(":", 1)[1].strip()
-        faces = []
-        for t in right.split():
-            try:
-                faces.append(int(t))
-            except Exception:
-                pass
+    return boundary_verts
 
-        # boundary edge if only one face is connected
-        if len(faces) != 1:
-            continue
+def _edge_to_faces(obj):
+    """One polyInfo call for all edges -> (E, 2) int32 connected face indices, -1 = no face."""
+    lines = cmds.polyInfo(f"{obj}.e[*]", edgeToFace=True) or []
+    # one line per edge, so no separate polyEvaluate for the count
+    edge_count = len(lines)
+    edge_faces = np.full((edge_count, 2), -1, dtype=np.int32)
 
-        vinfo = cmds.polyInfo(edge, edgeToVertex=True)
-        if not vinfo:
+    for line in lines:
+        if ":" not in line:
             continue
-
-        nums = re.findall(r"\d+", vinfo[0])
-        # nums example: ["5","12","13"] -> first is edge index, rest are vertex indices
-        for n in nums[1:]:
-            boundary_verts.add(int(n))
-
-    return boundary_verts
-
-def _edge_to_faces(obj, e_index):
-    info = cmds.polyInfo(f"{obj}.e[{e_index}]", edgeToFace=True) or []
-    if not info:
-        return []
-    line = info[0].strip()
-    if ":" not in line:
-        return []
-    right = line.split(":", 1)[1].strip()
-    faces = []
-    for t in right.split():
-        try:
-            faces.append(int(t))
-        except Exception:
-            pass
-    return faces
+        # "EDGE 5:  12 13" -> edge_faces[5] = [12, 13]
+        left, right = line.split(":", 1)
+        e = int(left.split()[-1])
+        faces = [int(t) for t in right.split() if t.isdigit()]
+        # non-manifold edges (3+ faces) stay -1/-1: neither boundary nor flippable
+        if e < edge_count and len(faces) <= 2:
+            edge_faces[e, :len(faces)] = faces
+
+    return edge_faces
+
+def _triangle_face_mask(obj):
+    """(F,) bool: True for faces with exactly 3 vertices (one MFnMesh.getVertices call)."""
+    counts, _ = om2.MFnMesh(_mesh_dag_path(obj)).getVertices()
+    return np.array(counts, dtype=np.int32) == 3
+
+def _edge_components(obj, edge_ids):
+    """Sorted, non-empty edge ids -> compact component list; consecutive runs become obj.e[a:b]."""
+    prefix_e = obj + ".e["
+    breaks = np.flatnonzero(np.diff(edge_ids) != 1) + 1
+    starts = np.concatenate((edge_ids[:1], edge_ids[breaks])).tolist()
+    ends = np.concatenate((edge_ids[breaks - 1], edge_ids[-1:])).tolist()
+    return [
+        f"{prefix_e}{a}]" if a == b else f"{prefix_e}{a}:{b}]"
+        for a, b in zip(starts, ends)
+    ]
+
+def _jitter_deltas(rng, vtx_count, boundary, jitter_amount, lock_axes):
+    """(N, 3) random deltas; locked axes and boundary verts stay 0. NumPy only, so safe off the main thread."""
+    deltas = rng.uniform(-jitter_amount, jitter_amount, (vtx_count, 3))
+    for axis, locked in enumerate(lock_axes):
+        if locked:
+            deltas[:, axis] = 0.0
+    if boundary:
+        boundary_mask = np.zeros(vtx_count, dtype=bool)
+        boundary_mask[np.fromiter(boundary, dtype=np.int64, count=len(boundary))] = True
+        deltas[boundary_mask] = 0.0
+    return deltas
 
 def random_triangulate_with_options(
     jitter_amount=0.02,
@@ -108,47 +124,66 @@ def random_triangulate_with_options(
         return
 
     lockX, lockY, lockZ = lock_axes
+    # all axes locked -> nothing can move, skip the randomize step entirely
+    do_jitter = not (lockX and lockY and lockZ)
+    # boundary verts are only used to mask the jitter
+    need_boundary = lock_boundary and do_jitter
     jitter_amount = float(jitter_amount)
     flip_probability = float(flip_probability)
     flip_iterations = max(1, int(flip_iterations))
+    # default_rng only takes non-negative seeds; the UI intField allows negatives
+    seed = int(seed) % 2**64
 
-    random.seed(int(seed))
+    # one generator per object, seeded with [seed, index]: reproducible, and neighbouring
+    # seeds don't just shift streams between objects (as seed + index would)
+    rngs = [np.random.default_rng([seed, i]) for i in range(len(objs))]
 
     cmds.undoInfo(openChunk=True)
+    prev_em = None
     try:
-        for obj in objs:
-            boundary = _boundary_vertex_indices(obj) if lock_boundary else set()
-            vtx_count = cmds.polyEvaluate(obj, vertex=True) or 0
-
-            moved = 0
-            for i in range(vtx_count):
-                if i in boundary:
-                    continue
-
-                comp = f"{obj}.vtx[{i}]"
-
-                # get current position
+        # no viewport redraw / parallel evaluation while editing; restored in finally
+        cmds.refresh(suspend=True)
+        prev_em = cmds.evaluationManager(q=True, mode=True)[0]
+        cmds.evaluationManager(mode="off")
+
+        # 1) main thread: read positions and boundary (cmds / om2 are not thread-safe)
+        coords_list, deltas_list = [], []
+        if do_jitter:
+            boundaries = []
+            for obj in objs:
+                boundaries.append(_boundary_vertex_indices(obj) if need_boundary else set())
+
+                # all positions in one query: flat [x0, y0, z0, x1, ...]
+                # (MFnMesh.getPoints/setPoints would need a per-MPoint copy into NumPy
+                #  and setPoints is not undoable, so stay on the xform slice)
                 if use_object_space:
-                    x, y, z = cmds.xform(comp, q=True, os=True, t=True)
+                    flat = cmds.xform(f"{obj}.vtx[*]", q=True, os=True, t=True)
                 else:
-                    x, y, z = cmds.xform(comp, q=True, ws=True, t=True)
-
-                # compute delta per axis (only if axis is NOT locked)
-                dx = 0.0 if lockX else random.uniform(-jitter_amount, jitter_amount)
-                dy = 0.0 if lockY else random.uniform(-jitter_amount, jitter_amount)
-                dz = 0.0 if lockZ else random.uniform(-jitter_amount, jitter_amount)
-
-                # skip if all locked (no movement)
-                if dx == 0.0 and dy == 0.0 and dz == 0.0:
-                    continue
-
-                # set new position
-                if use_object_space:
-                    cmds.xform(comp, os=True, t=(x + dx, y + dy, z + dz))
-                else:
-                    cmds.xform(comp, ws=True, t=(x + dx, y + dy, z + dz))
-
-                moved += 1
+                    flat = cmds.xform(f"{obj}.vtx[*]", q=True, ws=True, t=True)
+                coords_list.append(np.asarray(flat, dtype=np.float64).reshape(-1, 3))
+
+            # 2) worker threads: delta generation is pure NumPy and independent per object
+            with ThreadPoolExecutor() as ex:
+                deltas_list = list(ex.map(
+                    lambda i: _jitter_deltas(rngs[i], len(coords_list[i]), boundaries[i], jitter_amount, lock_axes),
+                    range(len(objs))
+                ))
+
+        # 3) main thread: write back, triangulate, flip
+        for i, obj in enumerate(objs):
+            moved = 0
+            if do_jitter:
+                coords, deltas = coords_list[i], deltas_list[i]
+                moved = int(np.count_nonzero(deltas.any(axis=1)))
+
+                # write back on the same slice in one command (undoable)
+                if moved:
+                    coords += deltas
+                    flat = coords.ravel().tolist()
+                    if use_object_space:
+                        cmds.xform(f"{obj}.vtx[*]", os=True, t=flat)
+                    else:
+                        cmds.xform(f"{obj}.vtx[*]", ws=True, t=flat)
 
             # triangulate
             if do_triangulate:
@@ -157,19 +192,31 @@ def random_triangulate_with_options(
             # optional: random edge flips (only some edges are flippable; that's OK)
             flipped = 0
             if do_flip:
-                edge_count = cmds.polyEvaluate(obj, edge=True) or 0
+                # flipping keeps every edge's face count, so one lookup serves all passes
+                edge_faces = _edge_to_faces(obj)
+                flippable = edge_faces[:, 1] != -1
+                if not do_triangulate:
+                    # without triangulate, quad / n-gon edges pass the face count but can't be flipped
+                    is_tri = _triangle_face_mask(obj)
+                    flippable &= is_tri[edge_faces[:, 0]] & is_tri[edge_faces[:, 1]]
+                rng = rngs[i]
                 for _ in range(flip_iterations):
-                    for e in range(edge_count):
-                        if random.random() > flip_probability:
-                            continue
-                        faces = _edge_to_faces(obj, e)
-                        if len(faces) != 2:
-                            continue
-                        try:
-                            cmds.polyFlipEdge(f"{obj}.e[{e}]", ch=keep_history)
-                            flipped += 1
-                        except Exception:
-                            pass
+                    # pick this pass's edges in one draw, then flip them in one command
+                    chosen = np.flatnonzero((rng.random(len(edge_faces)) <= flip_probability) & flippable)
+                    if not len(chosen):
+                        continue
+                    try:
+                        cmds.polyFlipEdge(_edge_components(obj, chosen), ch=keep_history)
+                        flipped += len(chosen)
+                    except Exception as exc:
+                        # one bad edge fails the whole batch: retry this pass edge by edge
+                        cmds.warning(f"{obj}: polyFlipEdge batch failed ({exc}); retrying per edge.")
+                        for e in chosen:
+                            try:
+                                cmds.polyFlipEdge(f"{obj}.e[{e}]", ch=keep_history)
+                                flipped += 1
+                            except Exception:
+                                pass
 
             if not keep_history:
                 cmds.delete(obj, ch=True)
@@ -179,7 +226,16 @@ def random_triangulate_with_options(
             cmds.inViewMessage(amg=msg, pos="midCenterTop", fade=True)
 
     finally:
-        cmds.undoInfo(closeChunk=True)
+        # nested so a failing restore can't skip the ones after it; closeChunk always last
+        try:
+            try:
+                if prev_em:
+                    cmds.evaluationManager(mode=prev_em)
+            finally:
+                cmds.refresh(suspend=False)
+                cmds.refresh()
+        finally:
+            cmds.undoInfo(closeChunk=True)
 
 # ---------------- UI ----------------
 